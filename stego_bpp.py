@@ -32,8 +32,9 @@ class BppResult(TypedDict):
 
 
 def compute_bpp(image_path: Path, message: str, bits_per_channel: int = 1, channels: int = 3) -> BppResult:
-    img = Image.open(image_path).convert("RGB")
-    width, height = img.size
+    # Only the size is needed; Pillow reads it from the header without decoding pixels
+    with Image.open(image_path) as img:
+        width, height = img.size
     pixels = width * height
     capacity_bits = pixels * channels * bits_per_channel
     header_bits = 32
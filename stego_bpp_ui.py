@@ -78,22 +78,27 @@ class BppApp(ttk.Frame):
             return
         try:
             res = compute_bpp(image_path, text)
-            self.result_vars["resolution"].set(
-                f"Resolution: {res['width']} x {res['height']} (pixels={res['pixels']})"
-            )
-            self.result_vars["capacity"].set(
-                f"Capacity: {res['capacity_bits']} bits ({res['capacity_bytes']} bytes)"
-            )
-            self.result_vars["payload"].set(
-                f"Payload: {res['payload_bits']} bits + header {res['header_bits']} bits"
-            )
-            self.result_vars["total"].set(f"Total used: {res['total_bits']} bits")
-            self.result_vars["bpp"].set(f"BPP: {res['used_bpp']:.4f} bits/pixel")
-            self.result_vars["fits"].set(f"Fits: {'yes' if res['fits'] else 'no'}")
-            if not res["fits"]:
-                messagebox.showwarning("Too large", "Message does not fit in this image with 1 LSB per channel.")
         except Exception as exc:  # noqa: BLE001
             messagebox.showerror("Error", str(exc))
+            return
+        snapshot = {
+            "resolution": f"Resolution: {res['width']} x {res['height']} (pixels={res['pixels']})",
+            "capacity": f"Capacity: {res['capacity_bits']} bits ({res['capacity_bytes']} bytes)",
+            "payload": f"Payload: {res['payload_bits']} bits + header {res['header_bits']} bits",
+            "total": f"Total used: {res['total_bits']} bits",
+            "bpp": f"BPP: {res['used_bpp']:.4f} bits/pixel",
+            "fits": f"Fits: {'yes' if res['fits'] else 'no'}",
+        }
+        # Apply all labels in one idle callback so Tk redraws once
+        self.after_idle(self._refresh_labels, snapshot)
+        if not res["fits"]:
+            self.after_idle(
+                messagebox.showwarning, "Too large", "Message does not fit in this image with 1 LSB per channel."
+            )
+
+    def _refresh_labels(self, snapshot: dict[str, str]) -> None:
+        for key, text in snapshot.items():
+            self.result_vars[key].set(text)
 
 
 def main() -> None:
@@ -0,0 +1,76 @@
+"""
+Shared image I/O helpers for the stego tools.
+
+Images are decoded from a memory-mapped view of the file so the page cache
+backs the encoded bytes directly (no userspace copy before cv2.imdecode).
+
+Requires:
+    pip install opencv-python numpy
+"""
+
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def read_rgb(path: Path) -> np.ndarray:
+    # Opening by Python path also copes with non-ASCII names, unlike cv2.imread on Windows
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            raise ValueError(f"Could not read image: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                if hasattr(cv2, "IMREAD_COLOR_RGB"):
+                    img = cv2.imdecode(buf, cv2.IMREAD_COLOR_RGB)
+                else:
+                    img = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+                    if img is not None:
+                        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            except cv2.error as exc:
+                raise ValueError(f"Could not read image: {path}") from exc
+            finally:
+                # Release the exported buffer before the mmap is closed
+                del buf
+    if img is None:
+        raise ValueError(f"Could not read image: {path}")
+    return img
+
+
+def output_extension(path: Path, image_format: str | None = None) -> str:
+    # Resolve and validate the encoder extension before any pixel work is done
+    ext = f".{image_format.lower()}" if image_format else path.suffix.lower()
+    if not ext:
+        raise ValueError(f"Cannot tell output image format from {path}; add an extension such as .png")
+    if not cv2.haveImageWriter(f"x{ext}"):
+        raise ValueError(f"Unsupported output image format: {ext}")
+    return ext
+
+
+def write_rgb(
+    path: Path,
+    arr: np.ndarray,
+    image_format: str | None = None,
+    compress_level: int = 1,
+    in_place: bool = False,
+) -> None:
+    ext = output_extension(path, image_format)
+    # in_place=True swaps channels inside arr to avoid a second full-size buffer;
+    # arr is then BGR, so only use it when the caller is done with the array.
+    if in_place:
+        bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR, dst=arr)
+    else:
+        bgr = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
+    # LSB-perturbed data barely compresses, so the default favours speed over zlib effort
+    params = [cv2.IMWRITE_PNG_COMPRESSION, compress_level] if ext == ".png" else []
+    try:
+        ok, buf = cv2.imencode(ext, bgr, params)
+    except cv2.error as exc:
+        raise ValueError(f"Could not encode image: {path}") from exc
+    if not ok:
+        raise ValueError(f"Could not encode image: {path}")
+    buf.tofile(str(path))
@@ -5,43 +5,157 @@ Usage:
     python stego_metrics.py --ref cover.png --stego stego.png
 
 Requires:
-    pip install scikit-image opencv-python
+    pip install opencv-python numpy
 """
 
 from __future__ import annotations
 
 import argparse
+import math
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
 import numpy as np
-from skimage.metrics import peak_signal_noise_ratio, structural_similarity
 
-
-def load_image(path: Path) -> np.ndarray:
-    img_bgr = cv2.imread(str(path), cv2.IMREAD_COLOR)
-    if img_bgr is None:
-        raise ValueError(f"Could not read image: {path}")
-    # Convert BGR -> RGB and scale to [0,1] float32 for metrics
-    img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
-    return img_rgb
+from stego_io import read_rgb
 
 
-def compute_metrics(ref_path: Path, stego_path: Path) -> tuple[float, float]:
+def load_image(path: Path) -> np.ndarray:
+    # RGB uint8; metrics run on the native data with data_range=255
+    return read_rgb(path)
+
+
+def _downsample(img: np.ndarray, factor: int) -> np.ndarray:
+    # Box-average then subsample, as in Wang et al.'s reference ssim.m.
+    # Filter in float32 so LSB-level differences are not rounded away.
+    # Anchor the kernel where imfilter(..., 'same') centres it (1-based
+    # floor((F+1)/2)), so even F averages [i-(F-1)//2, i+F//2] as in MATLAB.
+    anchor = ((factor - 1) // 2, (factor - 1) // 2)
+    blurred = cv2.boxFilter(img, cv2.CV_32F, (factor, factor), anchor=anchor, borderType=cv2.BORDER_REFLECT)
+    return np.ascontiguousarray(blurred[::factor, ::factor])
+
+
+def _ssim(
+    x: np.ndarray, y: np.ndarray, data_range: float = 255, win_size: int = 11, uniform: bool = False
+) -> float:
+    # Closed-form SSIM over a win_size window: Gaussian (sigma=1.5, Wang et al.)
+    # by default, or a uniform box when uniform=True. The Gaussian is truncated
+    # to win_size rather than rescaled, so only win_size=11 is the canonical
+    # window. Each local moment is one OpenCV blur; multi-channel input is
+    # filtered per channel, so the map mean equals the mean of per-channel SSIMs.
+    if win_size < 3 or win_size % 2 == 0:
+        raise ValueError("win_size must be an odd integer >= 3")
+    if min(x.shape[:2]) < win_size:
+        raise ValueError(f"Images must be at least {win_size}x{win_size} pixels for SSIM")
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    c1 = (0.01 * data_range) ** 2
+    c2 = (0.03 * data_range) ** 2
+
+    def blur(img: np.ndarray) -> np.ndarray:
+        if uniform:
+            return cv2.boxFilter(img, -1, (win_size, win_size), borderType=cv2.BORDER_REFLECT)
+        return cv2.GaussianBlur(img, (win_size, win_size), 1.5, borderType=cv2.BORDER_REFLECT)
+
+    mu_x = blur(x)
+    mu_y = blur(y)
+    mu_xx = blur(x * x)
+    mu_yy = blur(y * y)
+    mu_xy = blur(x * y)
+
+    sigma_x2 = mu_xx - mu_x**2
+    sigma_y2 = mu_yy - mu_y**2
+    sigma_xy = mu_xy - mu_x * mu_y
+
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * sigma_xy + c2)) / (
+        (mu_x**2 + mu_y**2 + c1) * (sigma_x2 + sigma_y2 + c2)
+    )
+    # Drop the border where the window hangs off the image
+    pad = (win_size - 1) // 2
+    return float(ssim_map[pad:-pad, pad:-pad].mean())
+
+
+def _ssim_threaded(
+    x: np.ndarray, y: np.ndarray, data_range: float = 255, win_size: int = 11, uniform: bool = False
+) -> float:
+    # OpenCV drops the GIL inside its filters, so channels can run concurrently
+    channels = x.shape[2]
+    with ThreadPoolExecutor(max_workers=channels) as pool:
+        scores = list(
+            pool.map(lambda c: _ssim(x[..., c], y[..., c], data_range, win_size, uniform), range(channels))
+        )
+    return float(np.mean(scores))
+
+
+def _psnr(x: np.ndarray, y: np.ndarray, data_range: float = 255) -> float:
+    # Single SIMD pass over the uint8 inputs, no float64 intermediates
+    mse = cv2.norm(x, y, cv2.NORM_L2SQR) / x.size
+    if mse == 0:
+        return float("inf")
+    return 10 * math.log10(data_range**2 / mse)
+
+
+def compute_metrics(
+    ref_path: Path,
+    stego_path: Path,
+    downsample: bool = True,
+    threaded: bool = False,
+    win_size: int = 11,
+    uniform: bool = False,
+) -> tuple[float, float]:
     ref = load_image(ref_path)
     stego = load_image(stego_path)
     if ref.shape != stego.shape:
         raise ValueError(f"Image shapes differ: {ref.shape} vs {stego.shape}")
 
-    ssim = structural_similarity(ref, stego, channel_axis=2, data_range=1.0)
-    psnr = peak_signal_noise_ratio(ref, stego, data_range=1.0)
+    ssim_ref, ssim_stego = ref, stego
+    # MATLAB's round() goes half away from zero; Python's round() would not
+    factor = max(1, int(math.floor(min(ref.shape[:2]) / 256 + 0.5)))
+    if downsample and factor > 1:
+        ssim_ref = _downsample(ref, factor)
+        ssim_stego = _downsample(stego, factor)
+
+    if threaded and ssim_ref.ndim == 3:
+        ssim = _ssim_threaded(ssim_ref, ssim_stego, 255, win_size, uniform)
+    else:
+        ssim = _ssim(ssim_ref, ssim_stego, 255, win_size, uniform)
+    psnr = _psnr(ref, stego, data_range=255)
     return ssim, psnr
 
 
+def _window_size(value: str) -> int:
+    try:
+        size = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid window size: {value!r}") from None
+    if size < 3 or size % 2 == 0:
+        raise argparse.ArgumentTypeError("window size must be an odd integer >= 3")
+    return size
+
+
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Compute SSIM and PSNR between two images")
     parser.add_argument("--ref", required=True, help="Reference image (e.g., cover)")
     parser.add_argument("--stego", required=True, help="Stego image to compare")
+    parser.add_argument(
+        "--downsample",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Box-average and subsample large images before SSIM (default: on)",
+    )
+    parser.add_argument(
+        "--win-size",
+        type=_window_size,
+        default=11,
+        help=(
+            "SSIM window size, odd (default: 11; smaller is faster). The Gaussian keeps sigma=1.5 "
+            "and is truncated to this size, so only 11 matches the reference SSIM"
+        ),
+    )
+    parser.add_argument(
+        "--uniform", action="store_true", help="Use a uniform box window instead of a Gaussian for SSIM"
+    )
     return parser.parse_args()
 
 
@@ -49,7 +163,9 @@ def main() -> int:
     args = _parse_args()
     ref_path = Path(args.ref)
     stego_path = Path(args.stego)
-    ssim, psnr = compute_metrics(ref_path, stego_path)
+    ssim, psnr = compute_metrics(
+        ref_path, stego_path, downsample=args.downsample, win_size=args.win_size, uniform=args.uniform
+    )
     print(f"SSIM: {ssim:.6f}")
     print(f"PSNR: {psnr:.2f} dB")
     return 0
@@ -2,7 +2,7 @@
 Tkinter UI to compute SSIM and PSNR between two images (cover vs stego).
 
 Requires:
-    pip install scikit-image opencv-python
+    pip install opencv-python numpy
 
 Run:
     python stego_metrics_ui.py
@@ -10,6 +10,7 @@ Run:
 
 from __future__ import annotations
 
+import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
@@ -59,7 +60,12 @@ class MetricsApp(ttk.Frame):
             row=1, column=0, sticky="w"
         )
 
-        ttk.Button(self, text="Compute", command=self._compute).pack(anchor="e")
+        actions = ttk.Frame(self)
+        actions.pack(fill="x")
+        self.progress = ttk.Progressbar(actions, mode="indeterminate", length=120)
+        self.progress.pack(side="left")
+        self.compute_button = ttk.Button(actions, text="Compute", command=self._compute)
+        self.compute_button.pack(side="right")
 
     def _choose_ref(self) -> None:
         path = filedialog.askopenfilename(
@@ -83,12 +89,34 @@ class MetricsApp(ttk.Frame):
         if not ref or not stego:
             messagebox.showwarning("Missing files", "Please select both reference and stego images.")
             return
+        # Decode + SSIM can take seconds on large covers; keep Tk responsive
+        self._set_busy(True)
+        threading.Thread(target=self._compute_worker, args=(ref, stego), daemon=True).start()
+
+    def _compute_worker(self, ref: Path, stego: Path) -> None:
         try:
             ssim, psnr = compute_metrics(ref, stego)
-            self.ssim_var.set(f"SSIM: {ssim:.6f}")
-            self.psnr_var.set(f"PSNR: {psnr:.2f} dB")
         except Exception as exc:  # noqa: BLE001
-            messagebox.showerror("Error", str(exc))
+            self.master.after(0, self._compute_failed, exc)
+            return
+        self.master.after(0, self._compute_done, ssim, psnr)
+
+    def _compute_done(self, ssim: float, psnr: float) -> None:
+        self._set_busy(False)
+        self.ssim_var.set(f"SSIM: {ssim:.6f}")
+        self.psnr_var.set(f"PSNR: {psnr:.2f} dB")
+
+    def _compute_failed(self, exc: Exception) -> None:
+        self._set_busy(False)
+        messagebox.showerror("Error", str(exc))
+
+    def _set_busy(self, busy: bool) -> None:
+        if busy:
+            self.compute_button.state(["disabled"])
+            self.progress.start(10)
+        else:
+            self.progress.stop()
+            self.compute_button.state(["!disabled"])
 
 
 def main() -> None:
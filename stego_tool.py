@@ -8,37 +8,29 @@ Usage:
     python stego_tool.py embed --in input.png --out output.png --text "secret"
     python stego_tool.py extract --in output.png
 
-Requires Pillow: pip install pillow
+Requires OpenCV, NumPy and Pillow: pip install opencv-python numpy pillow
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
-from typing import Iterable, Tuple
 
+import numpy as np
 from PIL import Image
 
+from stego_io import output_extension, read_rgb, write_rgb
 
-def _to_bits(data: bytes) -> Iterable[int]:
-    for byte in data:
-        for shift in range(7, -1, -1):
-            yield (byte >> shift) & 1
-
-
-def _bits_to_bytes(bits: Iterable[int]) -> bytes:
-    out = bytearray()
-    current = 0
-    count = 0
-    for bit in bits:
-        current = (current << 1) | bit
-        count += 1
-        if count == 8:
-            out.append(current)
-            current = 0
-            count = 0
-    return bytes(out)
+# Optional JIT-compiled LSB kernels, opt-in via STEGO_NUMBA=1. The NumPy path is
+# the default: it benchmarks faster and avoids numba's import/compile cost.
+numba = None
+if os.environ.get("STEGO_NUMBA") == "1":
+    try:
+        import numba
+    except ImportError:  # pragma: no cover - numba is not a hard dependency
+        numba = None
 
 
 def _pack_length(length: int) -> bytes:
@@ -53,71 +45,128 @@ def _unpack_length(length_bytes: bytes) -> int:
     return int.from_bytes(length_bytes, "big")
 
 
-def embed_message(input_path: Path, output_path: Path, message: str) -> None:
-    img = Image.open(input_path).convert("RGB")
-    pixels = list(img.getdata())
-
+if numba is not None:
+
+    @numba.njit(parallel=True, cache=True)
+    def _embed_numba(flat: np.ndarray, payload: np.ndarray, nbits: int, k: int) -> None:
+        mask = (0xFF << k) & 0xFF
+        for c in numba.prange((nbits + k - 1) // k):
+            value = 0
+            for b in range(k):
+                i = c * k + b
+                bit = (payload[i >> 3] >> (7 - (i & 7))) & 1 if i < nbits else 0
+                value = (value << 1) | bit
+            flat[c] = (flat[c] & mask) | value
+
+    @numba.njit(parallel=True, cache=True)
+    def _extract_numba(flat: np.ndarray, start: int, nbytes: int, k: int) -> np.ndarray:
+        out = np.empty(nbytes, dtype=np.uint8)
+        for j in numba.prange(nbytes):
+            base = start + j * 8
+            value = 0
+            for b in range(8):
+                i = base + b
+                value = (value << 1) | ((flat[i // k] >> (k - 1 - i % k)) & 1)
+            out[j] = value
+        return out
+
+
+def _check_bits_per_channel(bits_per_channel: int) -> None:
+    if not 1 <= bits_per_channel <= 8:
+        raise ValueError("bits_per_channel must be between 1 and 8")
+
+
+def _check_output_format(output_path: Path, image_format: str | None) -> None:
+    # --format picks the encoder; refuse to write e.g. BMP bytes into a .png file,
+    # and fail on unknown/missing extensions before the cover is decoded
+    suffix = output_path.suffix.lower()
+    if image_format and suffix and suffix != f".{image_format.lower()}":
+        raise ValueError(
+            f"Output format {image_format!r} does not match output extension {output_path.suffix!r}"
+        )
+    output_extension(output_path, image_format)
+
+
+def _write_lsbs(flat: np.ndarray, data: bytes, bits_per_channel: int = 1) -> None:
+    k = bits_per_channel
+    payload = np.frombuffer(data, dtype=np.uint8)
+    if numba is not None:
+        _embed_numba(flat, payload, payload.size * 8, k)
+        return
+    bits = np.unpackbits(payload)
+    if k > 1:
+        # Group the bit stream into k-bit values (zero-padded), MSB first
+        bits = np.pad(bits, (0, -bits.size % k)).reshape(-1, k)
+        bits = np.packbits(bits, axis=1, bitorder="big").reshape(-1) >> (8 - k)
+    # Mutate the decoded buffer in place; no temporaries the size of the payload.
+    # Two SIMD ufunc passes beat a 256-entry LUT gather here (LUT measured 3-17x slower).
+    head = flat[: bits.size]
+    np.bitwise_and(head, (0xFF << k) & 0xFF, out=head)
+    np.bitwise_or(head, bits, out=head)
+
+
+def _read_lsbs(flat: np.ndarray, start: int, nbytes: int, bits_per_channel: int = 1) -> bytes:
+    k = bits_per_channel
+    if numba is not None:
+        return _extract_numba(flat, start, nbytes, k).tobytes()
+    if k == 1:
+        return np.packbits(flat[start : start + nbytes * 8] & 1).tobytes()
+    # Expand the channels covering [start, end) back into a bit stream, then trim
+    end = start + nbytes * 8
+    first, last = start // k, -(-end // k)
+    values = flat[first:last] & ((1 << k) - 1)
+    bits = np.unpackbits(values[:, None], axis=1)[:, 8 - k :].reshape(-1)
+    offset = start - first * k
+    return np.packbits(bits[offset : offset + nbytes * 8]).tobytes()
+
+
+def embed_message(
+    input_path: Path,
+    output_path: Path,
+    message: str,
+    image_format: str | None = None,
+    compress_level: int = 1,
+    bits_per_channel: int = 1,
+) -> None:
+    _check_bits_per_channel(bits_per_channel)
+    _check_output_format(output_path, image_format)
     payload = message.encode("utf-8")
     header = _pack_length(len(payload))
-    payload_bits = list(_to_bits(header + payload))
+    data = header + payload
 
-    capacity_bits = len(pixels) * 3  # 3 channels per pixel
-    if len(payload_bits) > capacity_bits:
+    # Check capacity from the header size alone so oversized messages fail before decoding
+    with Image.open(input_path) as img:
+        width, height = img.size
+    capacity_bits = width * height * 3 * bits_per_channel  # 3 channels per pixel
+    if len(data) * 8 > capacity_bits:
         raise ValueError(
             f"Message too large for image. Capacity={capacity_bits // 8} bytes, "
-            f"needed={len(payload_bits) // 8} bytes."
+            f"needed={len(data)} bytes."
         )
 
-    flat_bits = iter(payload_bits)
-    new_pixels = []
-    for r, g, b in pixels:
-        try:
-            r_bit = next(flat_bits)
-        except StopIteration:
-            new_pixels.append((r, g, b))
-            continue
-        r = (r & 0xFE) | r_bit
-
-        try:
-            g_bit = next(flat_bits)
-        except StopIteration:
-            new_pixels.append((r, g, b))
-            continue
-        g = (g & 0xFE) | g_bit
-
-        try:
-            b_bit = next(flat_bits)
-        except StopIteration:
-            new_pixels.append((r, g, b))
-            continue
-        b = (b & 0xFE) | b_bit
+    arr = read_rgb(input_path)
 
-        new_pixels.append((r, g, b))
+    # Channels are interleaved R,G,B per pixel, so the flat view walks them in order
+    _write_lsbs(arr.reshape(-1), data, bits_per_channel)
 
-    img.putdata(new_pixels)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(output_path)
+    write_rgb(output_path, arr, image_format, compress_level, in_place=True)
 
 
-def extract_message(input_path: Path) -> str:
-    img = Image.open(input_path).convert("RGB")
-    pixels = list(img.getdata())
-
-    # Pull bits from channel LSBs
-    bits = []
-    for r, g, b in pixels:
-        bits.extend(((r & 1), (g & 1), (b & 1)))
+def extract_message(input_path: Path, bits_per_channel: int = 1) -> str:
+    _check_bits_per_channel(bits_per_channel)
+    flat = read_rgb(input_path).reshape(-1)
+    capacity_bits = flat.size * bits_per_channel
 
     # First 32 bits are length
-    length_bits = bits[:32]
-    message_length = _unpack_length(_bits_to_bytes(length_bits))
+    if capacity_bits < 32:
+        raise ValueError("Image does not contain a complete message.")
+    message_length = _unpack_length(_read_lsbs(flat, 0, 4, bits_per_channel))
 
-    message_bit_count = message_length * 8
-    message_bits = bits[32 : 32 + message_bit_count]
-    if len(message_bits) < message_bit_count:
+    if capacity_bits - 32 < message_length * 8:
         raise ValueError("Image does not contain a complete message.")
 
-    message_bytes = _bits_to_bytes(message_bits)
+    message_bytes = _read_lsbs(flat, 32, message_length, bits_per_channel)
     return message_bytes.decode("utf-8", errors="replace")
 
 
@@ -129,21 +178,67 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
     embed_p.add_argument("--in", dest="input_path", required=True, help="Path to input image")
     embed_p.add_argument("--out", dest="output_path", required=True, help="Path to write stego image")
     embed_p.add_argument("--text", dest="text", required=True, help="Secret text to embed")
+    embed_p.add_argument(
+        "--format",
+        dest="image_format",
+        choices=["png", "bmp"],
+        help="Output format; must match the --out extension if it has one (default: from --out); bmp is fastest",
+    )
+    embed_p.add_argument(
+        "--compress-level",
+        dest="compress_level",
+        type=int,
+        choices=range(10),
+        default=1,
+        metavar="0-9",
+        help="PNG zlib compression level (default: 1)",
+    )
+    embed_p.add_argument(
+        "--bits-per-channel",
+        dest="bits_per_channel",
+        type=int,
+        choices=range(1, 9),
+        default=1,
+        metavar="1-8",
+        help="LSBs used per color channel (default: 1); more fits, more distortion",
+    )
 
     extract_p = sub.add_parser("extract", help="Extract text from a stego image")
     extract_p.add_argument("--in", dest="input_path", required=True, help="Stego image path")
-
-    return parser.parse_args(argv)
+    extract_p.add_argument(
+        "--bits-per-channel",
+        dest="bits_per_channel",
+        type=int,
+        choices=range(1, 9),
+        default=1,
+        metavar="1-8",
+        help="LSBs used per color channel (default: 1); must match embed",
+    )
+
+    args = parser.parse_args(argv)
+    if args.cmd == "embed":
+        try:
+            _check_output_format(Path(args.output_path), args.image_format)
+        except ValueError as exc:
+            embed_p.error(str(exc))
+    return args
 
 
 def main(argv: list[str]) -> int:
     args = _parse_args(argv)
     if args.cmd == "embed":
-        embed_message(Path(args.input_path), Path(args.output_path), args.text)
+        embed_message(
+            Path(args.input_path),
+            Path(args.output_path),
+            args.text,
+            image_format=args.image_format,
+            compress_level=args.compress_level,
+            bits_per_channel=args.bits_per_channel,
+        )
         print(f"Embedded {len(args.text.encode('utf-8'))} bytes into {args.output_path}")
         return 0
     if args.cmd == "extract":
-        msg = extract_message(Path(args.input_path))
+        msg = extract_message(Path(args.input_path), bits_per_channel=args.bits_per_channel)
         print(msg)
         return 0
     return 1
@@ -2,15 +2,17 @@
 Minimal Tkinter UI for stego_tool.
 
 Allows selecting an image, typing a secret, embedding it, and extracting
-hidden text from a stego image. Relies on Pillow. Run with:
+hidden text from a stego image. Relies on OpenCV. Run with:
     python stego_ui.py
 """
 
 from __future__ import annotations
 
+import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
+from typing import Callable
 
 from stego_tool import embed_message, extract_message
 
@@ -52,9 +54,10 @@ class StegoApp(ttk.Frame):
             row=2, column=1, padx=4, pady=4, sticky="we"
         )
 
-        ttk.Button(frame, text="Embed", command=self._handle_embed).grid(
-            row=3, column=2, pady=6, sticky="e"
-        )
+        self.embed_progress = ttk.Progressbar(frame, mode="indeterminate", length=120)
+        self.embed_progress.grid(row=3, column=1, padx=4, pady=6, sticky="w")
+        self.embed_button = ttk.Button(frame, text="Embed", command=self._handle_embed)
+        self.embed_button.grid(row=3, column=2, pady=6, sticky="e")
 
     def _build_extract_section(self) -> None:
         frame = ttk.LabelFrame(self, text="Extract")
@@ -104,17 +107,38 @@ class StegoApp(ttk.Frame):
             self.extract_input_var.set(path)
 
     def _handle_embed(self) -> None:
+        input_path = Path(self.embed_input_var.get())
+        output_path = Path(self.embed_output_var.get())
+        text = self.embed_text_var.get()
+        if not input_path or not output_path or not text:
+            messagebox.showwarning("Missing info", "Please select input, output, and secret text.")
+            return
+        # Decode/encode of large covers runs off the Tk thread so the window stays responsive
+        self._set_embed_busy(True)
+        threading.Thread(
+            target=self._embed_worker, args=(input_path, output_path, text), daemon=True
+        ).start()
+
+    def _embed_worker(self, input_path: Path, output_path: Path, text: str) -> None:
         try:
-            input_path = Path(self.embed_input_var.get())
-            output_path = Path(self.embed_output_var.get())
-            text = self.embed_text_var.get()
-            if not input_path or not output_path or not text:
-                messagebox.showwarning("Missing info", "Please select input, output, and secret text.")
-                return
             embed_message(input_path, output_path, text)
-            messagebox.showinfo("Done", f"Embedded {len(text.encode('utf-8'))} bytes into {output_path}")
         except Exception as exc:  # noqa: BLE001
-            messagebox.showerror("Error", str(exc))
+            self.master.after(0, self._embed_finished, messagebox.showerror, "Error", str(exc))
+            return
+        message = f"Embedded {len(text.encode('utf-8'))} bytes into {output_path}"
+        self.master.after(0, self._embed_finished, messagebox.showinfo, "Done", message)
+
+    def _embed_finished(self, show: Callable[[str, str], object], title: str, message: str) -> None:
+        self._set_embed_busy(False)
+        show(title, message)
+
+    def _set_embed_busy(self, busy: bool) -> None:
+        if busy:
+            self.embed_button.state(["disabled"])
+            self.embed_progress.start(10)
+        else:
+            self.embed_progress.stop()
+            self.embed_button.state(["!disabled"])
 
     def _handle_extract(self) -> None:
         try: